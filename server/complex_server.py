@@ -14,7 +14,9 @@ __all__ = [
     'Server'
 ]
 
+import collections
 import pathlib
+import select
 import socket
 import sys
 import threading
@@ -97,6 +99,7 @@ class Server(threading.Thread):
         self.port = port
         self.database = database
         self.data_lock = threading.Lock()
+        self._wake_r, self._wake_w = socket.socketpair()
 
     def run(self):
         """Create and run a server loop for connecting clients."""
@@ -104,6 +107,10 @@ class Server(threading.Thread):
         server_socket.bind((self.host, self.port))
         server_socket.listen(5)
         while self.loop:
+            ready = select.select((server_socket, self._wake_r), (), ())[0]
+            if self._wake_r in ready:
+                self._wake_r.recv(1)
+                continue
             connection, address = server_socket.accept()
             with self.data_lock:
                 if self.loop:
@@ -113,6 +120,10 @@ class Server(threading.Thread):
                     Stack(server.handlers.BanFilter(client)).start()
         server_socket.close()
 
+    def wake(self):
+        """Nudge the accept loop so it notices a change to the loop flag."""
+        self._wake_w.send(b'x')
+
 
 class Client:
     """Client(socket, address) -> Client instance"""
@@ -120,6 +131,7 @@ class Client:
     RECEIVE_SIZE = 1 << 12
     BUFF_SIZE = 1 << 16
     SEPARATOR = b'\r\n'
+    OUTGOING_LIMIT = 1 << 10
 
     def __init__(self, connection, address, database):
         """Initialize variables that make up a client instance."""
@@ -128,6 +140,12 @@ class Client:
         self.address = address
         self.database = database
         self.buffer = bytes()
+        # Broadcast frames are queued here and drained by a lazily
+        # started writer thread; the deque drops oldest when full so a
+        # slow reader cannot back-pressure the channel.
+        self.outgoing = collections.deque(maxlen=self.OUTGOING_LIMIT)
+        self._outgoing_ready = threading.Condition()
+        self._writer = None
 
     def receive(self):
         """Return a line having a separator at its end."""
@@ -175,6 +193,33 @@ class Client:
         """Format arguments and send resulting string to client."""
         self.send(f'{sep.join(map(str, value))}{end}'.encode())
 
+    def deliver(self, text):
+        """Queue text for asynchronous delivery to this client."""
+        with self._outgoing_ready:
+            if self.closed:
+                return
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._drain,
+                                                daemon=True)
+                self._writer.start()
+            self.outgoing.append(text)
+            self._outgoing_ready.notify()
+
+    def _drain(self):
+        """Write queued frames to the socket in coalesced batches."""
+        while True:
+            with self._outgoing_ready:
+                while not self.outgoing and not self.closed:
+                    self._outgoing_ready.wait(1)
+                if not self.outgoing:
+                    return
+                batch = tuple(self.outgoing)
+                self.outgoing.clear()
+            try:
+                self.print('\n'.join(batch))
+            except (SystemExit, OSError):
+                return
+
 
 class Stack(threading.Thread):
     """Stack(handler) -> Stack instance"""
@@ -347,10 +392,12 @@ class Account:
         return contacts
 
     def show_message_summary(self, client, status, length, *,
-                             filter_status=None, filter_source=None):
+                             filter_status=None, filter_source=None,
+                             messages=None):
         """Print a formatted summary of the messages on this account."""
-        with self.data_lock:
-            messages = list(self.messages)
+        if messages is None:
+            with self.data_lock:
+                messages = list(self.messages)
         messages = self.prune_by_status(filter_status, messages)
         messages = self.prune_by_source(filter_source, messages)
         if messages:
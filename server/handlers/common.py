@@ -27,6 +27,18 @@ YES_WORDS = frozenset({'yes', 'true', '1'})
 class Handler(abc.ABC):
     """Handler(client) -> Handler instance"""
 
+    _commands = {}
+
+    def __init_subclass__(cls, **kwargs):
+        """Build the command table once as each handler class is defined."""
+        super().__init_subclass__(**kwargs)
+        commands = {}
+        for klass in reversed(cls.__mro__):
+            for name, attribute in vars(klass).items():
+                if name.startswith('do_'):
+                    commands[name[3:]] = attribute
+        cls._commands = commands
+
     def __init__(self, client):
         """Initialize handler by saving client to public attribute."""
         self.client = client
@@ -61,12 +73,10 @@ class Handler(abc.ABC):
                 return self.json_help()
             if cmd == '?':
                 cmd = 'help'
-            try:
-                func = getattr(self, 'do_' + cmd)
-            except AttributeError as error:
-                return error
-            else:
-                return func(args)
+            func = self._commands.get(cmd)
+            if func is None:
+                return AttributeError('do_' + cmd)
+            return func.__get__(self, type(self))(args)
 
     def json_help(self):
         """Send client information on what commands are available."""
@@ -77,13 +87,24 @@ class Handler(abc.ABC):
     @property
     def commands(self):
         """Provide a list of commands the server will respond to."""
-        return (name[3:] for name in dir(self) if name.startswith('do_'))
+        return iter(sorted(self._commands))
+
+    def get_token(self, args, prompt, kind=None):
+        """Get one whitespace-free token from args or by prompting."""
+        token = args[0] if args else self.client.input(prompt)
+        if not token:
+            self.client.print('Cancelling ...')
+            return None
+        if kind is not None and (len(args) > 1 or len(token.split()) > 1):
+            self.client.print(f'{kind} may not have whitespace!')
+            return None
+        return token
 
     def get_help(self, name):
         """Return the documentation string of command having name."""
         try:
-            func = getattr(self, 'do_' + name)
-        except AttributeError:
+            func = self._commands[name]
+        except KeyError:
             return 'Command not found!'
         doc = inspect.getdoc(func)
         if doc is None:
@@ -61,6 +61,7 @@ class OutsideMenu(common.Handler):
     ACCOUNTS = {}
     data_lock = threading.Lock()
     server_code = None
+    _admin_snap = frozenset()
 
     @classmethod
     def account_exists(cls, name):
@@ -68,15 +69,34 @@ class OutsideMenu(common.Handler):
         with cls.data_lock:
             return name in cls.ACCOUNTS
 
+    @classmethod
+    def load(cls, directory):
+        """Load static variables and rebuild the administrator snapshot."""
+        super().load(directory)
+        with cls.data_lock:
+            cls._refresh_administrators()
+
+    @classmethod
+    def refresh_administrators(cls):
+        """Rebuild the administrator snapshot after a flag has changed."""
+        with cls.data_lock:
+            cls._refresh_administrators()
+
+    @classmethod
+    def _refresh_administrators(cls):
+        """Recompute the snapshot (data_lock must already be held)."""
+        cls._admin_snap = frozenset(
+            name for name, account in cls.ACCOUNTS.items()
+            if account.administrator)
+
     @staticmethod
     def clean_name_from_channels(name):
         """Remove all references to name in channels."""
         for channel in InsideMenu.get_channels():
-            with channel.data_lock:
+            with channel._bans_lock:
                 if name in channel.muted_to_muter:
                     del channel.muted_to_muter[name]
-                while name in channel.banned:
-                    channel.banned.remove(name)
+                channel.banned.discard(name)
                 for muted in channel.muted_to_muter.keys():
                     muter = channel.muted_to_muter[muted]
                     if name in muter:
@@ -94,8 +114,25 @@ class OutsideMenu(common.Handler):
                     with account.data_lock:
                         if name in account.contacts:
                             account.contacts.remove(name)
+                cls._refresh_administrators()
         cls.clean_name_from_channels(name)
 
+    @classmethod
+    def disconnect_and_delete(cls, name):
+        """Disconnect the account identified by name and then delete it."""
+        with cls.data_lock:
+            if name not in cls.ACCOUNTS:
+                return False
+            cls.ACCOUNTS[name].force_disconnect()
+            del cls.ACCOUNTS[name]
+            for account in cls.ACCOUNTS.values():
+                with account.data_lock:
+                    if name in account.contacts:
+                        account.contacts.remove(name)
+            cls._refresh_administrators()
+        cls.clean_name_from_channels(name)
+        return True
+
     @classmethod
     def deliver_message(cls, source, name, text):
         """Send message to name via source with text if possible."""
@@ -114,9 +151,11 @@ class OutsideMenu(common.Handler):
     @classmethod
     def is_administrator(cls, name):
         """Check if account identified by name is an administrator."""
+        if name in cls._admin_snap:
+            return True
         with cls.data_lock:
             if name in cls.ACCOUNTS:
-                return cls.ACCOUNTS[name].administrator
+                return False
 
     @classmethod
     def is_online(cls, name):
@@ -217,6 +256,7 @@ class OutsideMenu(common.Handler):
                 return
             account = cls.ACCOUNTS[name] = server.complex_server.Account(
                 not bool(cls.ACCOUNTS))
+            cls._refresh_administrators()
         word = args[1] if len(args) > 1 else self.client.input('Password:')
         if len(word.split()) == 1:
             with account.data_lock:
@@ -225,6 +265,7 @@ class OutsideMenu(common.Handler):
         else:
             with self.data_lock:
                 del cls.ACCOUNTS[name]
+                cls._refresh_administrators()
             self.client.print('Password may not have whitespace!')
 
     def check_terms_of_service(self):
@@ -14,7 +14,7 @@ __all__ = [
 ]
 
 import ipaddress
-import socket
+import operator
 import sqlite3
 import textwrap
 import threading
@@ -25,17 +25,24 @@ from . import external
 from . import plugins
 
 
+_ENUM_TABLE = str.maketrans(',', ' ')
+_UNSET = object()
+_SINGULAR = 'person is'
+_PLURAL = 'people are'
+
+
 def enum(names):
     """Create a simple enumeration having similarities to C."""
     # noinspection PyTypeChecker
     return type('enum', (), dict(map(reversed, enumerate(
-        names.replace(',', ' ').split())), __slots__=()))()
+        names.translate(_ENUM_TABLE).split())), __slots__=()))
 
 
 class AdminConsole(common.Handler):
     """AdminConsole(client) -> AdminConsole instance"""
 
     shutdown = enum('server, users, admin, all')
+    _SLEEPER_FORMS = (' was', 's were')
 
     def handle(self):
         """Show client status of action and run command loop."""
@@ -211,25 +218,21 @@ class AdminConsole(common.Handler):
 
     def disconnect_and_remove(self, name):
         """Force account name to disconnect and then delete."""
-        with external.OutsideMenu.data_lock:
-            if name in external.OutsideMenu.ACCOUNTS:
-                external.OutsideMenu.ACCOUNTS[name].force_disconnect()
-            else:
-                self.client.print('Account does not exist.')
-                return False
-        external.OutsideMenu.delete_account(name)
-        return True
+        if external.OutsideMenu.disconnect_and_delete(name):
+            return True
+        self.client.print('Account does not exist.')
+        return False
 
     def disconnect_clients(self, message, client_array):
         """Send message to client and disconnect them."""
         count = 0
         for client in client_array:
-            if not hasattr(client, 'name'):
+            if getattr(client, 'name', _UNSET) is _UNSET:
                 client.print(message)
                 client.close(True)
                 count += 1
         self.client.print(f'{count} sleeper'
-                          f'{("s were", " was")[count == 1]} disconnected.')
+                          f'{self._SLEEPER_FORMS[count != 1]} disconnected.')
 
     def get_account_name(self):
         """Display accounts and get name for one of them."""
@@ -256,8 +259,7 @@ class AdminConsole(common.Handler):
         with server_thread.data_lock:
             if server_thread.loop:
                 server_thread.loop = False
-                socket.create_connection(
-                    ('localhost', self.client.server.port))
+                server_thread.wake()
                 self.client.print('Server has been shutdown.')
                 client_array = tuple(server_thread.clients)
             else:
@@ -290,6 +292,7 @@ class AccountEditor(common.Handler):
         if attr == 'admin':
             with account.data_lock:
                 admin = account.administrator = not account.administrator
+            external.OutsideMenu.refresh_administrators()
             self.client.print(f'{self.name} is {("not ", "")[admin]}'
                               f'an administrator now.')
         elif attr == 'password':
@@ -354,32 +357,77 @@ class ChannelServer(common.Handler):
         self.channel_name = channel_name
         self.owner = owner
         self.password = ''
-        self.buffer = []
+        # The buffer is a fixed-capacity ring; head and tail only grow, so
+        # a line lives at slot index % capacity until it gets overwritten.
+        self._ring = [None] * self.builtin_buffer_limit
+        self._head = 0
+        self._tail = 0
+        self._buffer_lock = threading.Lock()
+        # The revision ticks on every buffer mutation so the summary
+        # model cache knows when it is stale.
+        self._revision = 0
+        self._summary_cache = None
         self.buffer_size = None
         self.replay_size = 10
         self.status = self.state.start
-        self.data_lock = threading.Lock()
+        # Unrelated channel operations use separate locks so that they do
+        # not serialize with each other. When several must be held, they
+        # are always acquired in the order config, members, bans, buffer.
+        # Single-field reads of the config attributes above are GIL-atomic
+        # and skip the lock; writers still serialize through it. Likewise,
+        # the members lock only guards mutation of connected_clients and
+        # kicked; readers take GIL-atomic snapshots without acquiring it.
+        self._config_lock = server.structures.RWLock()
+        self._members_lock = threading.Lock()
+        self._bans_lock = threading.Lock()
         self.connected_clients = {}
         self.muted_to_muter = {}
-        self.kicked = []
-        self.banned = []
+        self.kicked = set()
+        self._kicked_snap = frozenset()
+        self.banned = set()
         self.admin_lock = threading.Lock()
         self.admin_name = ''
 
     def __getstate__(self):
         """Get the state of the channel for saving and pickling."""
         state = self.__dict__.copy()
-        del state['data_lock']
+        del state['_config_lock']
+        del state['_members_lock']
+        del state['_bans_lock']
         del state['admin_lock']
         del state['connected_clients']
+        del state['_buffer_lock']
+        del state['_ring'], state['_head'], state['_tail']
+        del state['_revision'], state['_summary_cache']
+        with self._buffer_lock:
+            state['buffer'] = list(self._buffer_lines(self._head, self._tail))
         return state
 
     def __setstate__(self, state):
         """Restore the state of the channel when loading and unpickling."""
+        buffer = state.pop('buffer', [])
+        state.pop('data_lock', None)
         self.__dict__.update(state)
-        self.data_lock = threading.Lock()
+        self._config_lock = server.structures.RWLock()
+        self._members_lock = threading.Lock()
+        self._bans_lock = threading.Lock()
         self.connected_clients = {}
         self.admin_lock = threading.Lock()
+        self._buffer_lock = threading.Lock()
+        self._ring = [None] * self.builtin_buffer_limit
+        self._head = self._tail = 0
+        for line in buffer[-self.builtin_buffer_limit:]:
+            self._ring[self._tail % self.builtin_buffer_limit] = line
+            self._tail += 1
+        self._revision = 0
+        self._summary_cache = None
+        # Channels saved before the mute registry used sets stored lists.
+        self.muted_to_muter = {
+            muted: set(muter) for muted, muter in self.muted_to_muter.items()
+        }
+        self.kicked = set(self.kicked)
+        self.banned = set(self.banned)
+        self._kicked_snap = frozenset(self.kicked)
 
     @staticmethod
     def get_size(client, args=None):
@@ -402,8 +450,7 @@ class ChannelServer(common.Handler):
     @property
     def client(self):
         """Get the correct client based on the current thread."""
-        with self.data_lock:
-            return self.connected_clients[threading.current_thread().ident]
+        return self.connected_clients[threading.get_ident()]
 
     def handle(self):
         """Handle people connecting to the channel server."""
@@ -411,9 +458,9 @@ class ChannelServer(common.Handler):
             handler = self.dispatch()
         finally:
             name = self.client.name
-            with self.data_lock:
-                while name in self.kicked:
-                    self.kicked.remove(name)
+            with self._members_lock:
+                self.kicked.discard(name)
+                self._rebuild_kicked_snap()
             self.disconnect()
         return handler
 
@@ -453,9 +500,8 @@ class ChannelServer(common.Handler):
     def do_invite(self, args):
         """Invite someone to join this channel."""
         client = self.client
-        with self.data_lock:
-            exists = self.channel_name is not None
-            password = self.password
+        exists = self.channel_name is not None
+        password = self.password
         if not exists:
             client.print('This channel has been permanently closed.')
             return
@@ -475,13 +521,13 @@ class ChannelServer(common.Handler):
                 if protected:
                     printer(name, 'cannot be kicked.')
                     return
-                with self.data_lock:
-                    connected = self.connected_clients.items()
+                connected = tuple(self.connected_clients.items())
                 for identity, client in connected:
                     if client.name == name:
-                        with self.data_lock:
+                        with self._members_lock:
                             if identity in self.connected_clients:
-                                self.kicked.append(name)
+                                self.kicked.add(name)
+                                self._rebuild_kicked_snap()
                                 printer(name, 'has been kicked.')
                                 break
                 else:
@@ -490,8 +536,7 @@ class ChannelServer(common.Handler):
     # noinspection PyUnusedLocal
     def do_list(self, args):
         """Show everyone connected to this channel."""
-        with self.data_lock:
-            client_list = tuple(self.connected_clients.values())
+        client_list = tuple(self.connected_clients.values())
         if len(client_list) == 1:
             self.client.print('You alone are on this channel.')
         else:
@@ -520,23 +565,22 @@ class ChannelServer(common.Handler):
     # noinspection PyUnusedLocal
     def do_summary(self, args):
         """Proof of concept: Mark V Shaney summarizes the channel."""
-        with self.data_lock:
-            buffer = self.buffer[:]
+        with self._buffer_lock:
+            buffer = list(self._buffer_lines(self._head, self._tail))
+            revision = self._revision
         if buffer:
             size = (len(buffer) + 3) // 4
-            return plugins.MVSHandler(self.client, buffer, size, self)
+            return plugins.MVSHandler(
+                self.client, buffer, size, self, revision
+            )
         else:
             self.client.print('There is nothing to summarize.')
 
     def do_whisper(self, args):
         """Send a message to one specific person."""
         client = self.client
-        name = args[0] if args else client.input('Who?')
-        if not name:
-            client.print('Cancelling ...')
-            return
-        if not external.OutsideMenu.account_exists(name):
-            client.print(name, 'does not exist.')
+        name = self.get_token(args, 'Who?')
+        if name is None:
             return
         message = client.input('Message:')
         if not message:
@@ -545,7 +589,7 @@ class ChannelServer(common.Handler):
         if self.send_whisper(name, message):
             client.print('Message sent.')
         else:
-            client.print(name, 'no longer has an account.')
+            client.print(name, 'does not exist.')
 
     def add_ban(self, client, name):
         """Try to ban user identified by name."""
@@ -554,10 +598,10 @@ class ChannelServer(common.Handler):
             if protected:
                 client.print(name, 'cannot be banned.')
             else:
-                with self.data_lock:
+                with self._bans_lock:
                     will_ban = name not in self.banned
                     if will_ban:
-                        self.banned.append(name)
+                        self.banned.add(name)
                 if will_ban:
                     self.do_kick([name], False)
                     client.print(name, 'has been banned.')
@@ -566,30 +610,33 @@ class ChannelServer(common.Handler):
 
     def add_line(self, name, line):
         """Add a line to the channel buffer."""
-        with self.data_lock:
+        channel_line = server.structures.ChannelLine(name, line)
+        with self._buffer_lock:
             if self.buffer_size is None:
                 buffer_size = self.builtin_buffer_limit
             else:
                 buffer_size = min(self.buffer_size, self.builtin_buffer_limit)
-            channel_line = server.structures.ChannelLine(name, line)
             if buffer_size:
-                self.buffer.append(channel_line)
-                if len(self.buffer) > buffer_size:
-                    del self.buffer[:len(self.buffer) - buffer_size]
-            return channel_line
+                self._ring[self._tail % self.builtin_buffer_limit] = \
+                    channel_line
+                self._tail += 1
+                if self._tail - self._head > buffer_size:
+                    self._head = self._tail - buffer_size
+                self._revision += 1
+        return channel_line
 
     def add_mute(self, muted, client):
         """Add someone to list of muted people."""
-        with self.data_lock:
+        with self._bans_lock:
             okay = external.OutsideMenu.account_exists(muted)
             if okay:
                 if muted in self.muted_to_muter:
                     muting_clients = self.muted_to_muter[muted]
                     if client.name not in muting_clients:
-                        muting_clients.append(client.name)
+                        muting_clients.add(client.name)
                         okay += 1
                 else:
-                    self.muted_to_muter[muted] = [client.name]
+                    self.muted_to_muter[muted] = {client.name}
                     okay += 1
         if okay:
             if okay > 1:
@@ -604,8 +651,7 @@ class ChannelServer(common.Handler):
 
     def authenticate(self):
         """Allow client to authenticate to the channel if needed."""
-        with self.data_lock:
-            password = self.password
+        password = self.password
         if not password or self.privileged(False):
             return True
         return self.client.input('Password to connect:') == password
@@ -613,10 +659,10 @@ class ChannelServer(common.Handler):
     def broadcast(self, channel_line, echo):
         """Send message to all connected clients except the sender."""
         client = self.client
-        with self.data_lock:
-            clients = tuple(self.connected_clients.values())
-            muter = self.muted_to_muter.get(channel_line.source, [])
-            kicked = tuple(self.kicked)
+        kicked = self._kicked_snap
+        clients = tuple(self.connected_clients.values())
+        with self._bans_lock:
+            muter = self.muted_to_muter.get(channel_line.source, ())
 
         # noinspection PyShadowingNames
         def accept(destination):
@@ -628,18 +674,19 @@ class ChannelServer(common.Handler):
                 return True
             return destination is not client
 
+        frame = channel_line.render()
         for destination in filter(accept, clients):
-            channel_line.echo(destination)
+            destination.deliver(frame)
 
     def connect(self, client):
         """Connect the client to this channel."""
-        with self.data_lock:
-            self.connected_clients[threading.current_thread().ident] = client
+        with self._members_lock:
+            self.connected_clients[threading.get_ident()] = client
         return self
 
     def del_ban(self, client, name):
         """Try to remove a ban from user identified by name."""
-        with self.data_lock:
+        with self._bans_lock:
             will_remove = name in self.banned
             if will_remove:
                 self.banned.remove(name)
@@ -653,7 +700,7 @@ class ChannelServer(common.Handler):
         """Remove someone from list of muted people."""
         if muted:
             message = muted + ' was not muted.'
-            with self.data_lock:
+            with self._bans_lock:
                 if muted in self.muted_to_muter:
                     muting_clients = self.muted_to_muter[muted]
                     if client.name in muting_clients:
@@ -667,39 +714,60 @@ class ChannelServer(common.Handler):
 
     def disconnect(self):
         """Remove the client from this channel's registry."""
-        with self.data_lock:
-            del self.connected_clients[threading.current_thread().ident]
+        with self._members_lock:
+            del self.connected_clients[threading.get_ident()]
 
     def dispatch(self):
         """Ensure the channel is setup before allow people to enter."""
         client = self.client
-        with self.data_lock:
-            if self.status == self.state.final:
-                return
-            if self.status == self.state.reset and client.name == self.owner:
-                self.status = self.state.start
+        with self._config_lock.writing():
             status = self.status
-            if self.status == self.state.start:
+            if status == self.state.final:
+                return
+            if status == self.state.reset and client.name == self.owner:
+                status = self.status = self.state.start
+            if status == self.state.start:
                 self.status = self.state.setup
         if status == self.state.start:
             try:
                 self.setup_channel()
             finally:
-                with self.data_lock:
-                    status = self.status = self.state.ready
+                self._set_status(self.state.ready)
+            return self.run_channel()
         if status in {self.state.setup, self.state.reset}:
             client.print(self.owner, 'is setting up this channel.')
             return
-        elif status == self.state.ready:
+        if status == self.state.ready:
             return self.run_channel()
-        else:
-            raise ValueError(str(status) + ' is not a proper status value!')
+        raise ValueError(str(status) + ' is not a proper status value!')
+
+    def _set_status(self, status):
+        """Write a new status value while holding the config lock."""
+        with self._config_lock.writing():
+            self.status = status
+
+    def _rebuild_kicked_snap(self):
+        """Recompute the kicked snapshot (members lock must be held)."""
+        self._kicked_snap = frozenset(self.kicked)
+
+    def kick_all(self):
+        """Kick every connected client (members lock must be held)."""
+        # connected_clients is keyed by thread ident, so the names have
+        # to come from the values; map avoids a Python-level loop body.
+        self.kicked.update(
+            map(operator.attrgetter('name'), self.connected_clients.values()))
+        self._rebuild_kicked_snap()
+
+    def _buffer_lines(self, head, tail):
+        """Iterate over the ring slots holding the given index range."""
+        ring, capacity = self._ring, self.builtin_buffer_limit
+        for index in range(head, tail):
+            yield ring[index % capacity]
 
     def is_protected(self, name):
         """Find out if user identified by name has certain protections."""
-        with self.data_lock:
-            if self.owner == name:
-                return True
+        if self.owner == name:
+            return True
         administrator = external.OutsideMenu.is_administrator(name)
         if administrator is None:
             self.client.print(name, 'does not exist.')
@@ -708,8 +776,8 @@ class ChannelServer(common.Handler):
 
     def list_ban(self, client):
         """List the names of users banned on this channel."""
-        with self.data_lock:
-            banned = tuple(self.banned)
+        with self._bans_lock:
+            banned = sorted(self.banned)
         if banned:
             client.print('Those that are banned from this channel:')
             for name in banned:
@@ -719,7 +787,7 @@ class ChannelServer(common.Handler):
 
     def list_mute(self, client):
         """List people who have been muted."""
-        with self.data_lock:
+        with self._bans_lock:
             m2m = self.muted_to_muter.copy()
         you_mute = []
         for muted in m2m:
@@ -733,10 +801,10 @@ class ChannelServer(common.Handler):
     def may_whisper(self, name):
         """Find out if client may whisper to user identified by name."""
         sender = self.client.name
-        with self.data_lock:
+        with self._bans_lock:
             if name in self.muted_to_muter.get(sender, ()):
                 return
-            clients = self.connected_clients.values()
+        clients = tuple(self.connected_clients.values())
         for client in clients:
             if client.name == name:
                 return client
@@ -749,10 +817,9 @@ class ChannelServer(common.Handler):
         self.broadcast(event, False)
         while True:
             line = client.input()
-            with self.data_lock:
-                if client.name in self.kicked:
-                    client.print('You have been kicked out of this channel.')
-                    return
+            if client.name in self._kicked_snap:
+                client.print('You have been kicked out of this channel.')
+                return
             if line.startswith(':'):
                 value = self.run_command(line[1:])
                 if value == '__json_help__':
@@ -773,17 +840,15 @@ class ChannelServer(common.Handler):
         with client.account.data_lock:
             if client.account.administrator:
                 return True
-        with self.data_lock:
-            if client.name == self.owner:
-                return True
+        if client.name == self.owner:
+            return True
         if show_error:
             client.print('Only administrators or channel owner may do that.')
 
     def run_channel(self):
         """Handle user entering channel and run message loop as needed."""
         client = self.client
-        with self.data_lock:
-            banned = client.name in self.banned
+        banned = client.name in self.banned
         if banned:
             client.print('You have been banned from this channel.')
         elif self.authenticate():
@@ -802,40 +867,39 @@ class ChannelServer(common.Handler):
 
     def replay_buffer(self):
         """Show the message buffer to client."""
-        with self.data_lock:
-            if self.replay_size is None:
-                buffer = tuple(self.buffer)
-            elif self.replay_size > 0:
-                buffer = tuple(self.buffer[-self.replay_size:])
-            else:
-                buffer = ()
-        client = self.client
-        for line in buffer:
-            line.echo(client)
+        replay_size = self.replay_size
+        with self._buffer_lock:
+            head, tail = self._head, self._tail
+        if replay_size is not None:
+            head = max(head, tail - replay_size) if replay_size else tail
+        if head == tail:
+            return
+        # Formatting outside the lock is safe since slots are only replaced
+        # once the tail laps them; a lapped reader just sees newer lines.
+        self.client.print(server.structures.ChannelLine.format_batch(
+            self._buffer_lines(head, tail)))
 
     def send_invitation(self, args, client):
         """Send an invitation to another users to join this channel."""
-        name = args[0] if args else client.input('Who?')
-        if name:
-            if name == client.name:
-                client.print('You are already here.')
-                return
-            with self.data_lock:
-                channel_name = self.channel_name
-            if channel_name is None:
-                client.print('This channel has been permanently closed.')
-                return
-            message = f'{client.name} has invited you to channel ' \
-                      f'{channel_name}.'
-            if self.password:
-                message += '\n\nUse this to get in: ' + repr(self.password)
-            if external.OutsideMenu.deliver_message(client.name, name,
-                                                    message):
-                client.print('Invitation has been sent.')
-            else:
-                client.print(name, 'does not exist.')
+        name = self.get_token(args, 'Who?')
+        if name is None:
+            return
+        if name == client.name:
+            client.print('You are already here.')
+            return
+        channel_name = self.channel_name
+        if channel_name is None:
+            client.print('This channel has been permanently closed.')
+            return
+        message = f'{client.name} has invited you to channel ' \
+                  f'{channel_name}.'
+        if self.password:
+            message += '\n\nUse this to get in: ' + repr(self.password)
+        if external.OutsideMenu.deliver_message(client.name, name,
+                                                message):
+            client.print('Invitation has been sent.')
         else:
-            client.print('Cancelling ...')
+            client.print(name, 'does not exist.')
 
     def send_whisper(self, name, message):
         """Send a whispered message to user identified by name."""
@@ -848,11 +912,9 @@ class ChannelServer(common.Handler):
 
     def show_status(self):
         """Show how many people are connected to the channel."""
-        with self.data_lock:
-            connected = len(self.connected_clients)
-        self.client.print(f'{connected} '
-                          f'{("people are", "person is")[connected == 1]} '
-                          f'connected.')
+        connected = len(self.connected_clients)
+        verb = _SINGULAR if connected == 1 else _PLURAL
+        self.client.print(f'{connected} {verb} connected.')
 
     def setup_buffer_size(self):
         """Allow the client to set the buffer size."""
@@ -860,7 +922,7 @@ class ChannelServer(common.Handler):
         answer = client.input('Do you want to set the buffer size?')
         if answer in common.YES_WORDS:
             size = self.get_size(client)
-            with self.data_lock:
+            with self._config_lock.writing():
                 self.buffer_size = size
 
     def setup_channel(self):
@@ -876,7 +938,7 @@ class ChannelServer(common.Handler):
             while True:
                 password = self.client.input('Set password to:')
                 if password:
-                    with self.data_lock:
+                    with self._config_lock.writing():
                         self.password = password
                     return
                 else:
@@ -888,7 +950,7 @@ class ChannelServer(common.Handler):
         answer = client.input('Do you want to set the replay size?')
         if answer in common.YES_WORDS:
             size = self.get_size(client)
-            with self.data_lock:
+            with self._config_lock.writing():
                 self.replay_size = size
 
     # The following commands will never be created using the current
@@ -929,7 +991,7 @@ class ChannelAdmin(common.Handler):
         """Acquire control of the channel and run the command loop."""
         admin = self.channel.admin_lock.acquire(False)
         if admin:
-            with self.channel.data_lock:
+            with self.channel._config_lock.writing():
                 self.channel.admin_name = self.client.name
             try:
                 self.client.print('Opening admin console ...')
@@ -949,26 +1011,28 @@ class ChannelAdmin(common.Handler):
     def do_buffer(self, args):
         """Set the buffer size of this channel."""
         size = ChannelServer.get_size(self.client, args)
-        with self.channel.data_lock:
+        with self.channel._config_lock.writing():
             self.channel.buffer_size = size
 
     # noinspection PyUnusedLocal
     def do_close(self, args):
         """Kick everyone off the channel (useful after delete)."""
-        with self.channel.data_lock:
-            for client in self.channel.connected_clients.values():
-                self.channel.kicked.append(client.name)
+        with self.channel._members_lock:
+            self.channel.kick_all()
         self.client.print('Everyone has been kicked off the channel.')
 
     # noinspection PyUnusedLocal
     def do_delete(self, args):
         """Un-register this channel as though it did not exist."""
-        with self.channel.data_lock:
-            deleted = self.channel.channel_name is None
-            if not deleted:
-                assert external.InsideMenu.delete_channel(
-                    self.channel.channel_name), \
-                    'Name was set, but it was not registered.'
+        # The admin lock serializes admin sessions, so reading the name,
+        # calling the registry, and committing need not share one critical
+        # section; the registry lock is never held under the config lock.
+        name = self.channel.channel_name
+        deleted = name is None
+        if not deleted:
+            assert external.InsideMenu.delete_channel(name), \
+                'Name was set, but it was not registered.'
+            with self.channel._config_lock.writing():
                 self.channel.channel_name = None
         if deleted:
             self.client.print('This channel had been previously deleted.')
@@ -978,14 +1042,15 @@ class ChannelAdmin(common.Handler):
     # noinspection PyUnusedLocal
     def do_finalize(self, args):
         """Delete, close, and reset the channel (returns you to main menu)."""
-        with self.channel.data_lock:
+        with self.channel._config_lock.writing():
             self.channel.status = ChannelServer.state.final
-            if self.channel.channel_name is not None:
-                external.InsideMenu.delete_channel(self.channel.channel_name)
-                self.channel.channel_name = None
-            for client in self.channel.connected_clients.values():
-                self.channel.kicked.append(client.name)
+            channel_name = self.channel.channel_name
+            self.channel.channel_name = None
+            with self.channel._members_lock:
+                self.channel.kick_all()
             self.reset_channel()
+        if channel_name is not None:
+            external.InsideMenu.delete_channel(channel_name)
         self.client.print('The channel has been finalized.')
         self.client.print('Returning to the main menu ...')
         return EOFError()
@@ -993,25 +1058,22 @@ class ChannelAdmin(common.Handler):
     # noinspection PyUnusedLocal
     def do_history(self, args):
         """Show the entire contents of the channel buffer."""
-        with self.channel.data_lock:
-            buffer = tuple(self.channel.buffer)
-        if buffer:
-            for line in buffer:
-                line.echo(self.client)
+        channel = self.channel
+        with channel._buffer_lock:
+            head, tail = channel._head, channel._tail
+        if head != tail:
+            self.client.print(server.structures.ChannelLine.format_batch(
+                channel._buffer_lines(head, tail)))
         else:
             self.client.print('The channel buffer is empty.')
 
     def do_owner(self, args):
         """Change the owner of this channel."""
-        new_owner = args[0] if args else self.client.input('New owner:')
-        if not new_owner:
-            self.client.print('Cancelling ...')
-            return
-        if len(args) > 1 or len(new_owner.split()) > 1:
-            self.client.print('Username may not have whitespace!')
+        new_owner = self.get_token(args, 'New owner:', 'Username')
+        if new_owner is None:
             return
         user_exists = False
-        with self.channel.data_lock:
+        with self.channel._config_lock.writing():
             different = new_owner != self.channel.owner
             if different:
                 user_exists = external.OutsideMenu.account_exists(new_owner)
@@ -1033,13 +1095,13 @@ class ChannelAdmin(common.Handler):
         if command == 'set':
             word = args[1] if len(args) > 1 else self.client.input('Password:')
             if word:
-                with self.channel.data_lock:
+                with self.channel._config_lock.writing():
                     self.channel.password = word
                 self.client.print('Password has been set to:', word)
             else:
                 self.client.print('Password may not be empty.')
         elif command == 'unset':
-            with self.channel.data_lock:
+            with self.channel._config_lock.writing():
                 self.channel.password = ''
             self.client.print('The password has been cleared.')
         else:
@@ -1048,23 +1110,19 @@ class ChannelAdmin(common.Handler):
     # noinspection PyUnusedLocal
     def do_purge(self, args):
         """Clear the contents of the channel buffer."""
-        with self.channel.data_lock:
-            self.channel.buffer = []
+        with self.channel._buffer_lock:
+            self.channel._head = self.channel._tail
+            self.channel._revision += 1
         self.client.print('The buffer has been cleared.')
 
     def do_rename(self, args):
         """Give this channel a new name not used by another channel."""
-        with self.channel.data_lock:
-            old_name = self.channel.channel_name
+        old_name = self.channel.channel_name
         if old_name is None:
             self.client.print('Deleted channels cannot be renamed.')
             return
-        new_name = args[0] if args else self.client.input('New name:')
-        if not new_name:
-            self.client.print('Cancelling ...')
-            return
-        if len(args) > 1 or len(new_name.split()) > 1:
-            self.client.print('Channel name may not have whitespace!')
+        new_name = self.get_token(args, 'New name:', 'Channel name')
+        if new_name is None:
             return
         exists, success = self.try_rename(new_name)
         self.show_rename_result(exists, success, new_name)
@@ -1072,27 +1130,26 @@ class ChannelAdmin(common.Handler):
     def do_replay(self, args):
         """Set the replay size of this channel."""
         size = ChannelServer.get_size(self.client, args)
-        with self.channel.data_lock:
+        with self.channel._config_lock.writing():
             self.channel.replay_size = size
 
     # noinspection PyUnusedLocal
     def do_reset(self, args):
         """Make the channel like new again with nothing in it."""
-        with self.channel.data_lock:
+        with self.channel._config_lock.writing():
             self.channel.status = ChannelServer.state.reset
-            for client in self.channel.connected_clients.values():
-                self.channel.kicked.append(client.name)
+            with self.channel._members_lock:
+                self.channel.kick_all()
             self.reset_channel()
         self.client.print('Channel has been reset, and you are its owner.')
 
     # noinspection PyUnusedLocal
     def do_settings(self, args):
         """Show channel owner, password, buffer size, and replay size."""
-        with self.channel.data_lock:
-            owner = self.channel.owner
-            password = self.channel.password
-            buffer_size = self.channel.buffer_size
-            replay_size = self.channel.replay_size
+        owner = self.channel.owner
+        password = self.channel.password
+        buffer_size = self.channel.buffer_size
+        replay_size = self.channel.replay_size
         self.client.print('Owner:      ', owner)
         self.client.print('Password:   ', password)
         size = 'Infinite' if buffer_size is None else buffer_size
@@ -1101,14 +1158,19 @@ class ChannelAdmin(common.Handler):
         self.client.print('Replay size:', size)
 
     def reset_channel(self):
-        """Restore the channel to a new-like condition."""
+        """Restore the channel to a new-like condition (config lock held)."""
         self.channel.owner = self.client.name
         self.channel.password = ''
-        self.channel.buffer = []
         self.channel.buffer_size = None
         self.channel.replay_size = 10
-        self.channel.muted_to_muter = {}
-        self.channel.banned = []
+        with self.channel._bans_lock:
+            self.channel.muted_to_muter = {}
+            self.channel.banned = set()
+        # Stale lines stay in their slots until the tail laps them, so a
+        # purge is just an index reset with no reallocation.
+        with self.channel._buffer_lock:
+            self.channel._head = self.channel._tail
+            self.channel._revision += 1
 
     def show_rename_result(self, exists, success, new_name):
         """Show the results of an attempted rename operation."""
@@ -1124,13 +1186,12 @@ class ChannelAdmin(common.Handler):
     def try_rename(self, new_name):
         """Try to rename the channel to a new name."""
         success = None
-        with self.channel.data_lock:
-            old_name = self.channel.channel_name
-            exists = old_name is not None
-            if exists:
-                success = external.InsideMenu.rename_channel(old_name,
-                                                             new_name)
-                if success:
+        old_name = self.channel.channel_name
+        exists = old_name is not None
+        if exists:
+            success = external.InsideMenu.rename_channel(old_name, new_name)
+            if success:
+                with self.channel._config_lock.writing():
                     self.channel.channel_name = new_name
         return exists, success
 
@@ -1194,15 +1255,11 @@ class MessageManager(common.Handler):
         data = self.parse_args(args, False)
         if data is not None:
             data.new = False
-            self.client.print('From:', data.source)
-            self.client.print('=' * 70)
-            paragraphs = data.message.split('\n\n')
-            for index, section in enumerate(paragraphs):
-                for line in textwrap.wrap(section.replace('\n', ' ')):
-                    self.client.print(line)
-                if index + 1 < len(paragraphs):
-                    self.client.print()
-            self.client.print('=' * 70)
+            wrapped = getattr(data, '_wrapped', None)
+            if wrapped is None:
+                wrapped = data._wrapped = self._wrap_message(data.message)
+            self.client.print('\n'.join(
+                [f'From: {data.source}', '=' * 70, *wrapped, '=' * 70]))
 
     def do_send(self, args):
         """Allows you to send a message to someone else."""
@@ -1210,9 +1267,6 @@ class MessageManager(common.Handler):
         if name == self.client.name:
             self.client.print('You are not allowed to talk to yourself.')
             return
-        if not external.OutsideMenu.account_exists(name):
-            self.client.print('Account does not exist.')
-            return
         text = self.get_message()
         if not text:
             self.client.print('Empty messages may not be sent.')
@@ -1220,7 +1274,7 @@ class MessageManager(common.Handler):
         if external.OutsideMenu.deliver_message(self.client.name, name, text):
             self.client.print('Message has been delivered.')
         else:
-            self.client.print(name, 'was removed while you were writing.')
+            self.client.print(name, 'does not exist.')
 
     # noinspection PyUnusedLocal
     def do_show(self, args, internal=False):
@@ -1232,34 +1286,56 @@ class MessageManager(common.Handler):
     def find_message(self, args, allow_all):
         """Find a message that the client has requested."""
         clue = args[0]
+        account = self.client.account
         try:
             index = int(clue) - 1
         except ValueError:
-            show = self.client.account.show_message_summary
+            with account.data_lock:
+                snapshot = tuple(account.messages)
+            show = account.show_message_summary
             if clue in {'read', 'unread'}:
-                messages = show(self.client, True, 70, filter_status=clue)
+                shown = show(self.client, True, 70, filter_status=clue,
+                             messages=snapshot)
             else:
-                messages = show(self.client, True, 70, filter_source=clue)
-            return self.pick_message(messages, allow_all)
+                shown = show(self.client, True, 70, filter_source=clue,
+                             messages=snapshot)
+            return self.pick_message(shown, allow_all)
         else:
-            with self.client.account.data_lock:
-                messages = tuple(self.client.account.messages)
-            if 0 <= index < len(messages):
-                return messages[index]
+            # A numeric clue only needs one element, so the lock is held
+            # for a bounds check and a single dereference.
+            with account.data_lock:
+                message = (account.messages[index]
+                           if 0 <= index < len(account.messages) else None)
+            if message is not None:
+                return message
             self.client.print('That is not a valid message number.')
 
+    @staticmethod
+    def _wrap_message(text):
+        """Wrap each paragraph of text into a flat list of output lines."""
+        parts = []
+        paragraphs = text.split('\n\n')
+        for index, section in enumerate(paragraphs):
+            parts.extend(textwrap.wrap(section.replace('\n', ' ')))
+            if index + 1 < len(paragraphs):
+                parts.append('')
+        return parts
+
     def get_message(self):
         """Get message to send from the client."""
         lines = []
-        self.client.print('Please compose your message.')
-        self.client.print('Enter 2 blank lines to send.')
-        self.client.print('=' * 70)
-        while lines[-2:] != ['', '']:
-            lines.append(self.client.input())
+        blanks = 0
+        self.client.print('Please compose your message.\n'
+                          'Enter 2 blank lines to send.\n' + '=' * 70)
+        while blanks < 2:
+            line = self.client.input()
+            blanks = blanks + 1 if not line else 0
+            lines.append(line)
         self.client.print('=' * 70)
-        while lines and not lines[0]:
-            del lines[0]
-        return '\n'.join(lines[:-2])
+        start = 0
+        while start < len(lines) and not lines[start]:
+            start += 1
+        return '\n'.join(lines[start:-2])
 
     def parse_args(self, args, allow_all):
         """Parse the arguments, show messages, and pick them."""
@@ -1306,6 +1382,7 @@ class AccountOptions(common.Handler):
             self.client.print('Your account and connection are being closed.')
             external.OutsideMenu.delete_account(self.client.name)
             self.client.close()
+            return
         self.client.print('Cancelling ...')
 
     def do_password(self, args):
@@ -14,11 +14,35 @@ __all__ = [
 ]
 
 import abc
+import functools
+import operator
+import re
 
 import server.timeout
 from . import common
 
 
+_MISSING = object()
+
+_OPERATORS = frozenset({'=', '+', '-', '*', '/', '//', '%',
+                        '**', '^', 'and', '&', 'or', '|',
+                        '==', '!=', '>', '<', '>=', '<='})
+
+_FLOAT_RE = re.compile(r'[-+]?(\d+\.?\d*|\.\d+)([eE][-+]?\d+)?$')
+
+
+@functools.lru_cache(maxsize=4096)
+def _const(value):
+    """Return a shared Constant node for the given value."""
+    return Constant(value)
+
+
+@functools.lru_cache(maxsize=4096)
+def _var(name):
+    """Return a shared Variable node for the given name."""
+    return Variable(name)
+
+
 class MathExpressionEvaluator(common.Handler):
     """MathExpressionEvaluator(client) -> MathExpressionEvaluator instance"""
 
@@ -55,18 +79,14 @@ class MathExpressionEvaluator(common.Handler):
             # tokens are separated by white-space
             for token in line.split():
                 # operations are processed later
-                if token in {'=', '+', '-', '*', '/', '//', '%',
-                             '**', '^', 'and', '&', 'or', '|',
-                             '==', '!=', '>', '<', '>=', '<='}:
+                if token in _OPERATORS:
                     tokens.append(token)
+                elif _FLOAT_RE.match(token):
+                    # token is constant if it looks like a number
+                    tokens.append(_const(float(token)))
                 else:
-                    # noinspection PyPep8,PyBroadException
-                    try:
-                        # token is constant if it can be converted to float
-                        tokens.append(Constant(float(token)))
-                    except:
-                        # ... otherwise we assume that it is a variable
-                        tokens.append(Variable(token))
+                    # ... otherwise we assume that it is a variable
+                    tokens.append(_var(token))
             lines.append(tokens)
         return lines
 
@@ -85,10 +105,10 @@ class MathExpressionEvaluator(common.Handler):
                                       Variable), 'Must Assign to Variable'
                 # construct an operation from the last tokens
                 tokens[-1] = self.flatten(tokens[-1])
-                # create as many assignment operations as needed
-                op = Operation(tokens[-2][0], '=', tokens[-1])
+                # create as many assignment nodes as needed
+                op = Assignment(tokens[-2][0].name, tokens[-1])
                 for token_index in range(len(tokens) - 3, -1, -1):
-                    op = Operation(tokens[token_index][0], '=', op)
+                    op = Assignment(tokens[token_index][0].name, op)
                 # replace the line with the final operation
                 lines[line_index] = op
             else:
@@ -141,23 +161,13 @@ class MathExpressionEvaluator(common.Handler):
 class Expression(abc.ABC):
     """Expression() -> TypeError exception"""
 
+    __slots__ = ()
+
     @abc.abstractmethod
     def __init__(self):
         """This is a base class for math expressions."""
         pass
 
-    def __repr__(self):
-        """Provide a useful representation of the expression object."""
-        kind = type(self).__name__
-        private = f'_{kind}__'
-        args = []
-        for name in self.__dict__:
-            if name.startswith(private):
-                value = self.__dict__[name]
-                name = name[len(private):]
-                args.append(f'{name}={value!r}')
-        return f'{kind}({", ".join(args)})'
-
     @abc.abstractmethod
     def evaluate(self, dictionary):
         """Expressions should be able to evaluate themselves."""
@@ -167,11 +177,17 @@ class Expression(abc.ABC):
 class Constant(Expression):
     """Constant(value) -> Constant instance"""
 
+    __slots__ = '_Constant__value',
+
     def __init__(self, value):
         """Initialize the constant with its value."""
         super().__init__()
         self.__value = value
 
+    def __repr__(self):
+        """Provide a useful representation of the constant."""
+        return f'Constant(value={self.__value!r})'
+
     def evaluate(self, dictionary):
         """Return the value when evaluated."""
         return self.__value
@@ -180,16 +196,23 @@ class Constant(Expression):
 class Variable(Expression):
     """Variable(name) -> Variable instance"""
 
+    __slots__ = '_Variable__name',
+
     def __init__(self, name):
         """Initialize the variable with its name."""
         super().__init__()
         self.__name = name
 
+    def __repr__(self):
+        """Provide a useful representation of the variable."""
+        return f'Variable(name={self.__name!r})'
+
     def evaluate(self, dictionary):
         """Try to find and return the value of the variable."""
-        if self.__name not in dictionary:
+        value = dictionary.get(self.__name, _MISSING)
+        if value is _MISSING:
             raise Exception('Unknown variable: ' + self.__name)
-        return dictionary[self.__name]
+        return value
 
     @property
     def name(self):
@@ -200,78 +223,107 @@ class Variable(Expression):
 class Operation(Expression):
     """Operation(left, op, right) -> Operation instance"""
 
+    __slots__ = ('_Operation__left', '_Operation__op',
+                 '_Operation__right', '_Operation__function')
+
+    OPERATORS = {'+': operator.add,
+                 '-': operator.sub,
+                 '*': operator.mul,
+                 '/': operator.truediv,
+                 '//': operator.floordiv,
+                 '%': operator.mod,
+                 '**': operator.pow,
+                 '^': lambda x, y: float(int(x) ^ int(y)),
+                 'and': lambda x, y: x and y,
+                 '&': lambda x, y: float(int(x) & int(y)),
+                 'or': lambda x, y: x or y,
+                 '|': lambda x, y: float(int(x) | int(y)),
+                 '==': lambda x, y: float(x == y),
+                 '!=': lambda x, y: float(x != y),
+                 '>': lambda x, y: float(x > y),
+                 '<': lambda x, y: float(x < y),
+                 '>=': lambda x, y: float(x >= y),
+                 '<=': lambda x, y: float(x <= y)}
+
     def __init__(self, left, op, right):
         """Initialize the operation with each side and operator."""
         super().__init__()
         self.__left = left
         self.__op = op
         self.__right = right
+        # Resolve the operator once at parse time so evaluation is a
+        # single call.
+        self.__function = self.OPERATORS.get(op)
+
+    def __repr__(self):
+        """Provide a useful representation of the operation."""
+        return f'Operation(left={self.__left!r}, ' \
+               f'op={self.__op!r}, right={self.__right!r})'
 
     def evaluate(self, dictionary):
         """Evaluate the operation based on the stored operator."""
-        if self.__op == '=':
-            assert isinstance(self.__left, Variable), 'Must Assign to Variable'
-            name = self.__left.name
-            value = self.__right.evaluate(dictionary)
-            dictionary[name] = value
-            return value
+        if self.__function is None:
+            raise Exception('Unknown operator: ' + self.__op)
         x = self.__left.evaluate(dictionary)
         y = self.__right.evaluate(dictionary)
-        return server.timeout.run_with_timeout(
-            5, 0.1, self.run_operation, self.__op, x, y
-        )
+        # Only exponentiation can run for an unbounded amount of time;
+        # every other operator is a cheap call not worth a worker
+        # process.
+        if self.__op == '**':
+            return server.timeout.run_with_timeout(
+                5, self.run_operation, self.__op, x, y
+            )
+        return self.__function(x, y)
 
     @staticmethod
     def run_operation(operation, x, y):
-        """Execute a switch that performs the work of an operation."""
-        if operation == '+':
-            return x + y
-        if operation == '-':
-            return x - y
-        if operation == '*':
-            return x * y
-        if operation == '/':
-            return x / y
-        if operation == '//':
-            return x // y
-        if operation == '%':
-            return x % y
-        if operation == '**':
-            return x ** y
-        if operation == '^':
-            return float(int(x) ^ int(y))
-        if operation == 'and':
-            return x and y
-        if operation == '&':
-            return float(int(x) & int(y))
-        if operation == 'or':
-            return x or y
-        if operation == '|':
-            return float(int(x) | int(y))
-        if operation == '==':
-            return float(x == y)
-        if operation == '!=':
-            return float(x != y)
-        if operation == '>':
-            return float(x > y)
-        if operation == '<':
-            return float(x < y)
-        if operation == '>=':
-            return float(x >= y)
-        if operation == '<=':
-            return float(x <= y)
-        raise Exception('Unknown operator: ' + operation)
+        """Execute a dictionary search to perform the work of an operation."""
+        try:
+            function = Operation.OPERATORS[operation]
+        except KeyError:
+            raise Exception('Unknown operator: ' + operation) from None
+        return function(x, y)
+
+
+class Assignment(Expression):
+    """Assignment(name, expression) -> Assignment instance"""
+
+    __slots__ = '_Assignment__name', '_Assignment__expression'
+
+    def __init__(self, name, expression):
+        """Initialize the assignment with its target name and expression."""
+        super().__init__()
+        self.__name = name
+        self.__expression = expression
+
+    def __repr__(self):
+        """Provide a useful representation of the assignment."""
+        return f'Assignment(name={self.__name!r}, ' \
+               f'expression={self.__expression!r})'
+
+    def evaluate(self, dictionary):
+        """Bind the expression's value to the name and return it."""
+        value = self.__expression.evaluate(dictionary)
+        dictionary[self.__name] = value
+        return value
 
 
 class Print(Expression):
     """Print(expression, printer) -> Print instance"""
 
+    __slots__ = '_Print__expression', '_Print__print'
+
     def __init__(self, expression, printer):
         """Initialize the Print instance with an expression and printer."""
         super().__init__()
         self.__expression = expression
         self.__print = printer
 
+    def __repr__(self):
+        """Provide a useful representation of the print expression."""
+        return f'Print(expression={self.__expression!r}, ' \
+               f'print={self.__print!r})'
+
     def evaluate(self, dictionary):
         """Print the expression with the printer and return."""
         value = self.__expression.evaluate(dictionary)
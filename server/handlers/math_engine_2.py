@@ -14,7 +14,9 @@ __all__ = [
 ]
 
 import abc
+import functools
 import operator
+import re
 import sys
 import traceback
 
@@ -22,6 +24,69 @@ import server.timeout
 from . import common
 
 
+_MISSING = object()
+
+_BASES = {'x': 16, 'd': 10, 'o': 8, 'q': 4, 'b': 2}
+
+_TOKEN_RE = re.compile(r"""\s*(
+    ->|\*\*|<<|>>|<=|>=|==|!=|&&|\|\||
+    0[xdoqb][0-9A-Fa-f]+|
+    \d+|
+    [A-Za-z_]\w*|
+    [-+*/%&|^<>]
+    )""", re.VERBOSE)
+
+
+def _tokenize(expression):
+    """Scan the expression into a flat token list in one linear pass."""
+    expression = expression.strip()
+    tokens = []
+    index = 0
+    while index < len(expression):
+        match = _TOKEN_RE.match(expression, index)
+        if match is None:
+            raise SyntaxError(expression[index:])
+        tokens.append(match.group(1))
+        index = match.end()
+    return tokens
+
+
+@functools.lru_cache(maxsize=4096)
+def _const(value):
+    """Return a shared Constant node for the given value."""
+    return Constant(value)
+
+
+@functools.lru_cache(maxsize=4096)
+def _var(name):
+    """Return a shared Variable node for the given name."""
+    return Variable(name)
+
+
+@functools.lru_cache(maxsize=512)
+def _compile(expression):
+    """Compile an expression to a code object where the syntax allows.
+
+    Returns a (code, target) pair where target is the variable name for
+    an assignment or None for a plain evaluation. (None, None) signals
+    that the expression must fall back to tree evaluation, either
+    because it does not parse or because it uses an operator that needs
+    the timeout machinery."""
+    try:
+        tree = MathEvaluator._tokens(expression)
+    except Exception:
+        return None, None
+    target = None
+    if isinstance(tree, Assignment):
+        target = tree.name
+        tree = tree.expression
+    try:
+        source = tree.to_source()
+    except NotImplementedError:
+        return None, None
+    return compile(source, '<expression>', 'eval'), target
+
+
 class MathEvaluator(common.Handler):
     """MathEvaluator2(client) -> MathEvaluator2 instance"""
 
@@ -42,7 +107,16 @@ class MathEvaluator(common.Handler):
     def evaluate(self, source, local):
         """Execute all math operations found in the source."""
         for expression in self.expressions(source):
-            local['_'] = self.tokens(expression).evaluate(local)
+            code, target = _compile(expression.strip())
+            if code is None:
+                local['_'] = self.tokens(expression).evaluate(local)
+                continue
+            value = eval(code, {'__builtins__': {}}, local)
+            if target is None:
+                self.client.print(value)
+            else:
+                local[target] = value
+            local['_'] = value
 
     @staticmethod
     def expressions(source):
@@ -58,91 +132,131 @@ class MathEvaluator(common.Handler):
     def tokens(self, string):
         """Build an expression tree by tokenizing expression."""
         evaluator = self._tokens(string)
-        if isinstance(evaluator, Operation):
-            if evaluator.symbol == Operation.ASSIGNMENT:
-                return evaluator
+        if isinstance(evaluator, Assignment):
+            return evaluator
         return Print(evaluator, self.client.print)
 
-    def _tokens(self, string):
-        """Private module function: recursively builds a tree."""
-        expression = string.strip()
-        if not expression:
+    @staticmethod
+    def _tokens(string):
+        """Build a tree from the expression with one precedence pass."""
+        tokens = _tokenize(string)
+        if not tokens:
             raise SyntaxError('empty expression')
-        divisions = Operation.split(expression)
-        if divisions:
-            left, symbol, right = divisions
-            return Operation(self._tokens(left), symbol, self._tokens(right))
-        if len(expression.split()) > 1:
+        tree, position = MathEvaluator._parse(tokens, 0, 0)
+        if position != len(tokens):
+            raise SyntaxError(' '.join(tokens[position:]))
+        return tree
+
+    @staticmethod
+    def _parse(tokens, position, min_precedence):
+        """Climb operator precedence to build a subtree from tokens."""
+        node, position = MathEvaluator._atom(tokens, position)
+        while position < len(tokens):
+            symbol = tokens[position]
+            precedence = Operation.PRECEDENCE.get(symbol)
+            if precedence is None or precedence < min_precedence:
+                break
+            if symbol in Operation.RIGHT_ASSOCIATIVE:
+                right_minimum = precedence
+            else:
+                right_minimum = precedence + 1
+            right, position = MathEvaluator._parse(tokens, position + 1,
+                                                   right_minimum)
+            if symbol == Operation.ASSIGNMENT:
+                if not isinstance(right, Variable):
+                    raise TypeError(right)
+                node = Assignment(right.name, node)
+            else:
+                node = Operation(node, symbol, right)
+        return node, position
+
+    @staticmethod
+    def _atom(tokens, position):
+        """Convert the token at position into a leaf node."""
+        if position >= len(tokens):
+            raise SyntaxError('incomplete expression')
+        expression = tokens[position]
+        if expression in Operation.OPERATORS:
             raise SyntaxError(expression)
-        if expression.startswith('0x'):
-            return Constant(int(expression[2:], 16))
-        if expression.startswith('0d'):
-            return Constant(int(expression[2:], 10))
-        if expression.startswith('0o'):
-            return Constant(int(expression[2:], 8))
-        if expression.startswith('0q'):
-            return Constant(int(expression[2:], 4))
-        if expression.startswith('0b'):
-            return Constant(int(expression[2:], 2))
+        position += 1
+        if len(expression) > 2 and expression[0] == '0' \
+                and expression[1] in _BASES:
+            base = _BASES[expression[1]]
+            return _const(int(expression[2:], base)), position
         if expression.isdigit():
-            return Constant(int(expression))
+            return _const(int(expression)), position
         if expression.isidentifier():
-            return Variable(expression)
+            return _var(expression), position
         raise SyntaxError(expression)
 
 
 class Expression(abc.ABC):
     """Abstract class for Expression objects."""
 
+    __slots__ = ()
+
     @abc.abstractmethod
     def __init__(self):
         """Initialize the Expression object."""
         pass
 
-    def __repr__(self):
-        """Return a representation of this object."""
-        kind = type(self).__name__
-        private = f'_{kind}__'
-        args = []
-        for name in vars(self):
-            if name.startswith(private):
-                key = name[len(private):]
-                value = getattr(self, name)
-                args.append(f'{key}={value!r}')
-        return f'{kind}({", ".join(args)})'
-
     @abc.abstractmethod
     def evaluate(self, bindings):
         """Calculate the value of this object."""
         pass
 
+    def to_source(self):
+        """Lower this object to Python source where supported."""
+        raise NotImplementedError(type(self).__name__)
+
 
 class Constant(Expression):
     """Class for storing all math constants."""
 
+    __slots__ = '_Constant__value',
+
     def __init__(self, value):
         """Initialize the Constant object."""
         super().__init__()
         self.__value = value
 
+    def __repr__(self):
+        """Return a representation of this object."""
+        return f'Constant(value={self.__value!r})'
+
     def evaluate(self, bindings):
         """Calculate the value of this object."""
         return self.__value
 
+    def to_source(self):
+        """Lower this object to Python source."""
+        return repr(self.__value)
+
 
 class Variable(Expression):
     """Class for storing all math variables."""
 
+    __slots__ = '_Variable__name',
+
     def __init__(self, name):
         """Initialize the Variable object."""
         super().__init__()
         self.__name = name
 
+    def __repr__(self):
+        """Return a representation of this object."""
+        return f'Variable(name={self.__name!r})'
+
     def evaluate(self, bindings):
         """Calculate the value of this object."""
-        if self.__name not in bindings:
+        value = bindings.get(self.__name, _MISSING)
+        if value is _MISSING:
             raise NameError(self.__name)
-        return bindings[self.__name]
+        return value
+
+    def to_source(self):
+        """Lower this object to Python source."""
+        return self.__name
 
     @property
     def name(self):
@@ -153,9 +267,12 @@ class Variable(Expression):
 class Operation(Expression):
     """Class for executing math operations."""
 
+    __slots__ = ('_Operation__left', '_Operation__symbol',
+                 '_Operation__right', '_Operation__function',
+                 '_Operation__needs_timeout')
+
     ASSIGNMENT = '->'
-    OPERATORS = {ASSIGNMENT: lambda a, b: None,
-                 '&&': operator.and_,
+    OPERATORS = {'&&': operator.and_,
                  '||': operator.or_,
                  '+': operator.add,
                  '-': operator.sub,
@@ -174,6 +291,56 @@ class Operation(Expression):
                  '>=': operator.ge,
                  '<': operator.lt,
                  '<=': operator.le}
+    # Operators whose result size is not bounded by their operand
+    # sizes: exponentiation, and left shift whose output grows
+    # exponentially with the right operand's digit count. These must
+    # run on a killable worker under a deadline.
+    UNBOUNDED = frozenset({'**', '<<'})
+    # Spellings for lowering to Python source; the unbounded operators
+    # '**' and '<<' are deliberately absent so they keep their timeout
+    # protection, and the engine's '/' and logical operators map onto
+    # their integer forms.
+    PYTHON_SYMBOLS = {'&&': '&',
+                      '||': '|',
+                      '+': '+',
+                      '-': '-',
+                      '*': '*',
+                      '/': '//',
+                      '%': '%',
+                      '&': '&',
+                      '|': '|',
+                      '^': '^',
+                      '>>': '>>',
+                      '==': '==',
+                      '!=': '!=',
+                      '>': '>',
+                      '>=': '>=',
+                      '<': '<',
+                      '<=': '<='}
+    # Binding strength for the precedence-climbing parser; only
+    # exponentiation associates to the right. Assignment stays left
+    # associative so that chains like 5 -> x -> y assign in order.
+    PRECEDENCE = {ASSIGNMENT: 0,
+                  '||': 1,
+                  '&&': 2,
+                  '==': 3,
+                  '!=': 3,
+                  '>': 3,
+                  '>=': 3,
+                  '<': 3,
+                  '<=': 3,
+                  '|': 4,
+                  '^': 5,
+                  '&': 6,
+                  '<<': 7,
+                  '>>': 7,
+                  '+': 8,
+                  '-': 8,
+                  '*': 9,
+                  '/': 9,
+                  '%': 9,
+                  '**': 10}
+    RIGHT_ASSOCIATIVE = frozenset({'**'})
 
     def __init__(self, left, symbol, right):
         """Initialize the Operation object."""
@@ -181,69 +348,111 @@ class Operation(Expression):
         self.__left = left
         self.__symbol = symbol
         self.__right = right
+        # Resolve the operator and its need for timeout protection at
+        # parse time.
+        self.__function = self.OPERATORS.get(symbol)
+        self.__needs_timeout = symbol in self.UNBOUNDED
+
+    def __repr__(self):
+        """Return a representation of this object."""
+        return f'Operation(left={self.__left!r}, ' \
+               f'symbol={self.__symbol!r}, right={self.__right!r})'
 
     def evaluate(self, bindings):
         """Calculate the value of this object."""
-        if self.__symbol == self.ASSIGNMENT:
-            if not isinstance(self.__right, Variable):
-                raise TypeError(self.__right)
-            key = self.__right.name
-            value = self.__left.evaluate(bindings)
-            bindings[key] = value
-            return value
         return self.__operate(bindings)
 
     def __operate(self, bindings):
         """Execute operation defined by symbol."""
-        if self.__symbol not in self.OPERATORS:
+        function = self.__function
+        if function is None:
             raise SyntaxError(self.__symbol)
         a = self.__left.evaluate(bindings)
         b = self.__right.evaluate(bindings)
-        return server.timeout.run_with_timeout(
-            5, 0.1, self.run_operation, self.__symbol, a, b
-        )
+        if self.__needs_timeout:
+            return server.timeout.run_with_timeout(
+                5, self.run_operation, self.__symbol, a, b
+            )
+        return function(a, b)
 
     @staticmethod
     def run_operation(symbol, a, b):
         """Execute a dictionary search to perform the work of an operation."""
         return Operation.OPERATORS[symbol](a, b)
 
-    __operators = sorted(OPERATORS, key=len, reverse=True)
-
-    @classmethod
-    def split(cls, expression):
-        """Split expression on rightmost symbol."""
-        tail = cls.__split(expression)
-        if tail:
-            symbol, right = tail
-            return expression[:-sum(map(len, tail))], symbol, right
-
-    @classmethod
-    def __split(cls, expression):
-        """Private class method: help with split."""
-        for symbol in cls.__operators:
-            if symbol in expression:
-                right = expression.rsplit(symbol, 1)[1]
-                tail = cls.__split(right)
-                if tail is None:
-                    return symbol, right
-                return tail
+    def to_source(self):
+        """Lower this object to Python source where supported."""
+        symbol = self.PYTHON_SYMBOLS.get(self.__symbol)
+        if symbol is None:
+            raise NotImplementedError(self.__symbol)
+        return f'({self.__left.to_source()} {symbol} ' \
+               f'{self.__right.to_source()})'
 
     @property
     def symbol(self):
         """Property of the operation's symbol."""
         return self.__symbol
 
+    @property
+    def left(self):
+        """Property of the operation's left operand."""
+        return self.__left
+
+    @property
+    def right(self):
+        """Property of the operation's right operand."""
+        return self.__right
+
+
+class Assignment(Expression):
+    """Class for binding values to math variables."""
+
+    __slots__ = '_Assignment__name', '_Assignment__expression'
+
+    def __init__(self, name, expression):
+        """Initialize the Assignment object."""
+        super().__init__()
+        self.__name = name
+        self.__expression = expression
+
+    def __repr__(self):
+        """Return a representation of this object."""
+        return f'Assignment(name={self.__name!r}, ' \
+               f'expression={self.__expression!r})'
+
+    def evaluate(self, bindings):
+        """Calculate the value of this object."""
+        value = self.__expression.evaluate(bindings)
+        bindings[self.__name] = value
+        return value
+
+    @property
+    def name(self):
+        """Property of the assignment's target name."""
+        return self.__name
+
+    @property
+    def expression(self):
+        """Property of the assignment's bound expression."""
+        return self.__expression
+
 
 class Print(Expression):
     """Class for printing all math results."""
 
+    __slots__ = '_Print__expression', '_Print__print'
+
     def __init__(self, expression, printer):
         """Initialize the Print object."""
         super().__init__()
         self.__expression = expression
         self.__print = printer
 
+    def __repr__(self):
+        """Return a representation of this object."""
+        return f'Print(expression={self.__expression!r}, ' \
+               f'print={self.__print!r})'
+
     def evaluate(self, bindings):
         """Calculate the value of this object."""
         value = self.__expression.evaluate(bindings)
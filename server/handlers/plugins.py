@@ -13,80 +13,98 @@ __all__ = [
     'MVSHandler'
 ]
 
+import array
+import bisect
 import collections
 import functools
 import itertools
 import random
+import sys
 
 from . import common
 
 
 class MVSHandler(common.Handler):
-    """MarkVShaney(client, buffer, size, channel) -> MarkVShaney instance"""
+    """MVSHandler(client, buffer, size, channel, revision) ->
+    MVSHandler instance"""
 
     MARKOV_CHAIN_LENGTH = 3
     MAX_SUMMARY_FAILING = 5
 
-    def __init__(self, client, buffer, size, channel):
-        """Initialize the handler for summarizing the channel."""
+    def __init__(self, client, buffer, size, channel, revision):
+        """Initialize the handler for summarizing the channel.
+
+        The revision is captured under the buffer lock along with the
+        buffer snapshot, so the two always describe the same state."""
         super().__init__(client)
         self.buffer = buffer
         self.size = size
         self.channel = channel
+        self.revision = revision
 
     def handle(self):
         """Provide a Mark V Shaney summary of the channel and return."""
-        array = self.prepare()
-        mvs = MarkVShaney(array, self.MARKOV_CHAIN_LENGTH)
+        mvs = self.build_model()
         cache = mvs.build_paragraph(
             self.MAX_SUMMARY_FAILING, self.size, True, True
         )
         self.print_summary(cache)
         self.channel.connect(self.client)
 
+    def build_model(self):
+        """Return the channel's summary model, rebuilding when stale."""
+        # The model lives on the channel keyed by the buffer revision
+        # snapshotted with the buffer, so repeated summaries of an
+        # unchanged buffer reuse it and a concurrent mutation cannot
+        # cache a stale model under the new revision.
+        revision = self.revision
+        cached = self.channel._summary_cache
+        if cached is not None and cached[0] == revision:
+            return cached[1]
+        mvs = MarkVShaney(self.prepare(), self.MARKOV_CHAIN_LENGTH)
+        self.channel._summary_cache = revision, mvs
+        return mvs
+
     def prepare(self):
-        """Process the text into a stream of sentences and return it."""
-        stream = []
+        """Yield the buffered text as a stream of terminated sentences."""
+        # The chain build consumes the stream exactly once, so there is
+        # no reason to materialize the whole word list first.
+        term_set = MarkVShaney.TERMINATORS
+        terms = tuple(term_set)
+        pick = random.choice
         for line in self.buffer:
-            words = line.message.split()
-            if words[-1][-1] not in MarkVShaney.TERMINATORS:
-                words[-1] += random.choice(tuple(MarkVShaney.TERMINATORS))
-            stream.extend(words)
-        return stream
+            words = line.words
+            last = words[-1]
+            if last[-1] not in term_set:
+                words = words[:-1] + (sys.intern(last + pick(terms)),)
+            yield from words
 
     def print_summary(self, cache):
         """Print the summary provided in the given cache."""
         if cache:
             line = '~' * max(map(len, cache))
-            self.client.print(line)
-            for sentence in cache:
-                self.client.print(sentence)
-            self.client.print(line)
+            self.client.print('\n'.join((line, *cache, line)))
         else:
             self.client.print('There is nothing worth summarizing.')
 
 
-def pairwise(iterable, n=2):
-    """Using a window of width n, iterate over items sourced from iterable."""
-    iterators = itertools.tee(iterable, n)
-    for move, iterator in enumerate(iterators):
-        for _ in range(move):
-            next(iterator, None)
-    return zip(*iterators)
-
-
 class RandomCounter:
     """RandomCounter(counter) -> RandomCounter instance"""
 
-    def __init__(self, counter, choices=random.choices):
+    def __init__(self, counter, random_=random.random):
         """Initialize the instance with population and weight data."""
         population, weights = [], []
         for key, value in counter.items():
             population.append(key)
             weights.append(value)
         self.__population = tuple(population)
-        self.__cum_weights = tuple(itertools.accumulate(weights))
-        self.__choices = choices
+        # Fixed-width unsigned integers keep the weight table compact
+        # and give bisect a flat buffer to search.
+        self.__cum_weights = array.array(
+            'Q', itertools.accumulate(weights)
+        )
+        self.__total = self.__cum_weights[-1] if self.__cum_weights else 0
+        self.__random = random_
 
     def __iter__(self):
         """Return the iterator object itself."""
@@ -94,9 +112,12 @@ class RandomCounter:
 
     def __next__(self):
         """Return another completely random item from the counter."""
-        return self.__choices(
-            self.__population, cum_weights=self.__cum_weights
-        )[0]
+        # A direct bisection over the cumulative weights skips the
+        # argument validation random.choices repeats on every call.
+        index = bisect.bisect_right(
+            self.__cum_weights, self.__random() * self.__total
+        )
+        return self.__population[index]
 
 
 class MarkovChain:
@@ -105,28 +126,38 @@ class MarkovChain:
     def __init__(self, iterable, n):
         """Initialize the instance by building a database of usable links."""
         links = {}
-        for *root, suffix in pairwise(iterable, n):
-            links.setdefault(tuple(root), collections.Counter())[suffix] += 1
-        self.__links = {
-            key: RandomCounter(value) for key, value in links.items()
-        }
+        # A bounded deque keeps one sliding window over the stream
+        # instead of the n tee'd iterators pairwise needed.
+        window = collections.deque(maxlen=n)
+        for item in iterable:
+            window.append(item)
+            if len(window) == n:
+                root = tuple(itertools.islice(window, n - 1))
+                links.setdefault(root, collections.Counter())[item] += 1
+        # Keep the raw counters and build samplers on first use; most
+        # roots are never visited by any one chain.
+        self.__links = links
+        self.__samplers = {}
 
     def build_chain(self, start_point):
         """Iterate over items from the chain until a dead end is found."""
         if start_point not in self.__links:
             raise KeyError(f'could not find {start_point!r} in the links')
         yield from start_point
+        links, samplers = self.__links, self.__samplers
         while True:
-            try:
-                random_counter = self.__links[start_point]
-            except KeyError:
-                break
-            else:
-                item = next(random_counter)
-                yield item
-                prefix, *root = start_point
-                root.append(item)
-                start_point = tuple(root)
+            # The cache holds each sampler's bound __next__ so a step
+            # is one dict probe and one direct call per word.
+            draw = samplers.get(start_point)
+            if draw is None:
+                counter = links.get(start_point)
+                if counter is None:
+                    break
+                draw = samplers[start_point] = \
+                    RandomCounter(counter).__next__
+            item = draw()
+            yield item
+            start_point = start_point[1:] + (item,)
 
     @property
     def keys(self):
@@ -134,26 +165,6 @@ class MarkovChain:
         return self.__links.keys()
 
 
-class SpecialDeque(collections.deque):
-    """SpecialDeque([iterable[, maxlen]]) -> SpecialDeque instance"""
-
-    @property
-    def prefix(self):
-        """Property allowing capture of all but last item in deque."""
-        item = self.pop()
-        value = tuple(self)
-        self.append(item)
-        return value
-
-    @property
-    def suffix(self):
-        """Property allowing capture of all but first item in deque."""
-        item = self.popleft()
-        value = tuple(self)
-        self.appendleft(item)
-        return value
-
-
 class MarkVShaney(MarkovChain):
     """MarkVShaney(iterable, n) -> MarkVShaney instance"""
 
@@ -172,15 +183,21 @@ class MarkVShaney(MarkovChain):
     @classmethod
     def __get_start_words(cls, iterable, n, start_words):
         """Transparently yield from iterable while collecting start words."""
-        buffer = SpecialDeque(maxlen=n)
-        for count, item in enumerate(iterable, 1):
+        # The window is kept as a tuple and rolled by one item, so the
+        # prefix and suffix fall out as plain slices.
+        window = ()
+        for item in iterable:
             yield item
-            buffer.append(item)
-            if count == n:
-                start_words[buffer.prefix] += 1
-            if count >= n and buffer[0][-1] in cls.TERMINATORS:
-                start_words[buffer.suffix] += 1
-        if len(buffer) < n:
+            if len(window) < n:
+                window += (item,)
+                if len(window) < n:
+                    continue
+                start_words[window[:-1]] += 1
+            else:
+                window = window[1:] + (item,)
+            if window[0][-1] in cls.TERMINATORS:
+                start_words[window[1:]] += 1
+        if len(window) < n:
             raise ValueError('iterable was too short to satisfy n')
 
     def build_chain(self, start_point=None):
@@ -194,16 +211,21 @@ class MarkVShaney(MarkovChain):
         """Generate some clauses that have a relationship with each other."""
         if attempts < 1:
             raise ValueError('attempts must not be less than one')
+        # Bind the names touched on every word outside the loop; the
+        # per-token cost here dominates paragraph generation.
+        terminators = self.TERMINATORS
         for _ in range(attempts):
             iterator, paragraph, sentence = self.build_chain(), [], []
+            next_word = iterator.__next__
+            add_word = sentence.append
             while len(paragraph) < clauses:
                 try:
-                    word = next(iterator)
+                    word = next_word()
                 except StopIteration:
                     break
                 else:
-                    sentence.append(word)
-                    if word[-1] in self.TERMINATORS:
+                    add_word(word)
+                    if word[-1] in terminators:
                         paragraph.append(' '.join(sentence))
                         sentence.clear()
             else:
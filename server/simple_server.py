@@ -1,32 +1,47 @@
 #! /usr/bin/env python3
-import select
-import socket
-
-
-def main():
-    a = [socket.socket(socket.AF_INET, socket.SOCK_STREAM)]  # socket array
-    a[0].bind(('', 8989))
-    a[0].listen(5)
-    while True:
-        for b in select.select(a, [], [])[0]:  # ready socket
-            if b is a[0]:
-                a.append(b.accept()[0])
-            else:
-                try:
-                    c = b.recv(1 << 12)  # sent message
-                except socket.error:
-                    b.shutdown(socket.SHUT_RDWR)
-                    b.close()
-                    a.remove(b)
-                else:
-                    for d in (d for d in a[1:] if d is not b):  # message sink
-                        try:
-                            d.sendall(c)
-                        except ConnectionAbortedError:
-                            d.shutdown(socket.SHUT_RDWR)
-                            d.close()
-                            a.remove(d)
+import asyncio
+
+peers = set()  # writer array
+
+
+async def send(peer, data):
+    peer.write(data)
+    await peer.drain()
+
+
+async def broadcast(source, data):
+    # Snapshot the peers so failed writers can be removed after the
+    # sends, which all run concurrently instead of one by one.
+    targets = [peer for peer in peers if peer is not source]
+    results = await asyncio.gather(
+        *(send(peer, data) for peer in targets), return_exceptions=True
+    )
+    for peer, result in zip(targets, results):
+        if isinstance(result, Exception):
+            peers.discard(peer)
+            peer.close()
+
+
+async def handle(reader, writer):
+    peers.add(writer)
+    try:
+        while True:
+            data = await reader.read(1 << 12)  # sent message
+            if not data:
+                break
+            await broadcast(writer, data)
+    except ConnectionError:
+        pass
+    finally:
+        peers.discard(writer)
+        writer.close()
+
+
+async def main():
+    server = await asyncio.start_server(handle, '', 8989)
+    async with server:
+        await server.serve_forever()
 
 
 if __name__ == '__main__':
-    main()
+    asyncio.run(main())
@@ -11,27 +11,102 @@ __date__ = '18 December 2017'
 __version__ = 1, 0, 0
 __all__ = [
     'ChannelLine',
-    'Message'
+    'Message',
+    'RWLock'
 ]
 
+import contextlib
+import sys
+import threading
+
+
+class RWLock:
+    """RWLock() -> RWLock instance"""
+
+    def __init__(self):
+        """Initialize the counter and locks the instance requires."""
+        self.__readers = 0
+        self.__reader_lock = threading.Lock()
+        self.__writer_lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def reading(self):
+        """Allow any number of readers in while no writer is active."""
+        with self.__reader_lock:
+            self.__readers += 1
+            if self.__readers == 1:
+                self.__writer_lock.acquire()
+        try:
+            yield self
+        finally:
+            with self.__reader_lock:
+                self.__readers -= 1
+                if not self.__readers:
+                    self.__writer_lock.release()
+
+    @contextlib.contextmanager
+    def writing(self):
+        """Allow one writer in only when all readers have left."""
+        with self.__writer_lock:
+            yield self
+
 
 class ChannelLine:
     """ChannelLine(source, message) -> ChannelLine instance"""
 
+    __slots__ = 'source', 'message', 'words'
+
     def __init__(self, source, message):
         """Initialize structure with message and its source."""
         self.source = source
         self.message = message
+        # Tokenized and interned once here so every summary over the
+        # buffer skips the split.
+        self.words = tuple(map(sys.intern, message.split()))
+
+    def __setstate__(self, state):
+        """Restore lines saved before slots and the words cache existed.
+
+        Lines pickled before __slots__ carry a plain attribute dict,
+        while newer ones arrive as the standard (dict, slots) pair."""
+        if isinstance(state, tuple):
+            dict_state, slot_state = state
+            state = {**(dict_state or {}), **(slot_state or {})}
+        for name, value in state.items():
+            setattr(self, name, value)
+        if 'words' not in state:
+            self.words = tuple(map(sys.intern, self.message.split()))
+
+    def render(self):
+        """Return the formatted form of this line."""
+        return f'[{self.source}] {self.message}'
 
     def echo(self, client):
         """Print a formatted line to the client."""
-        client.print(f'[{self.source}] {self.message}')
+        client.print(self.render())
+
+    @classmethod
+    def format_batch(cls, lines):
+        """Join the rendered form of many lines for a single write."""
+        return '\n'.join(line.render() for line in lines)
 
 
 class Message(ChannelLine):
     """Message(source, message) -> Message instance"""
 
+    # The _wrapped slot backs the lazy line-wrapping cache filled in
+    # by the message reader.
+    __slots__ = 'new', '_wrapped'
+
     def __init__(self, source, message):
         """Initialize message that includes new (read/unread) flag."""
         super().__init__(source, message)
         self.new = True
+
+    def __setstate__(self, state):
+        """Restore messages from any save format, defaulting the flag.
+
+        The _wrapped cache stays unset until the reader fills it in."""
+        super().__setstate__(state)
+        if not hasattr(self, 'new'):
+            self.new = True
@@ -14,40 +14,108 @@ __all__ = [
 ]
 
 import multiprocessing
+import queue
 import sys
+import threading
 import time
 
 DEFAULT_TIMEOUT = 60
 
 
-def set_timeout(limit=None):
-    """Return a wrapper that provides a timeout API for callers."""
+def set_timeout(limit=None, use_process=True):
+    """Return a wrapper that provides a timeout API for callers.
+
+    Process mode can terminate uncooperative CPU-bound code; thread
+    mode skips the fork and argument pickling, which suits IO-bound
+    entry points, but an expired call is abandoned rather than killed."""
     if limit is None:
         limit = DEFAULT_TIMEOUT
     _Timeout.validate_limit(limit)
 
     def wrapper(entry_point):
-        return _Timeout(entry_point, limit)
+        if use_process:
+            return _Timeout(entry_point, limit)
+        return _ThreadTimeout(entry_point, limit)
 
     return wrapper
 
 
-def run_with_timeout(limit, polling_interval, entry_point, *args, **kwargs):
-    """Execute a callable object and automatically poll for results."""
+def run_with_timeout(limit, entry_point, *args, **kwargs):
+    """Execute a callable object and block until it finishes or times out."""
     engine = set_timeout(limit)(entry_point)
     engine(*args, **kwargs)
-    while engine.ready is False:
-        time.sleep(polling_interval)
+    engine.wait(limit)
     return engine.value
 
 
-def _target(queue, entry_point, *args, **kwargs):
-    """Help with multiprocessing calls by being a top-level module function."""
-    # noinspection PyPep8,PyBroadException
-    try:
-        queue.put((True, entry_point(*args, **kwargs)))
-    except:
-        queue.put((False, sys.exc_info()[1]))
+def _serve(jobs, results):
+    """Execute jobs from a queue for the lifetime of a worker process."""
+    while True:
+        entry_point, args, kwargs = jobs.get()
+        # noinspection PyPep8,PyBroadException
+        try:
+            results.put((True, entry_point(*args, **kwargs)))
+        except:
+            results.put((False, sys.exc_info()[1]))
+
+
+class _Worker:
+    """_Worker() -> _Worker instance"""
+
+    def __init__(self):
+        """Initialize a long-lived process that serves one job at a time."""
+        self.__jobs = multiprocessing.Queue(1)
+        self.__results = multiprocessing.Queue(1)
+        self.__process = multiprocessing.Process(
+            target=_serve, args=(self.__jobs, self.__results), daemon=True
+        )
+        self.__process.start()
+
+    def submit(self, entry_point, args, kwargs):
+        """Hand a job to the worker process without waiting on it."""
+        self.__jobs.put((entry_point, args, kwargs))
+
+    def poll(self):
+        """Return the finished job's result pair or None if still running."""
+        try:
+            return self.__results.get_nowait()
+        except queue.Empty:
+            return None
+
+    def wait(self, timeout):
+        """Block up to timeout seconds for the job's result pair."""
+        try:
+            return self.__results.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def terminate(self):
+        """Kill the worker process; a terminated worker cannot be reused."""
+        self.__process.terminate()
+
+
+class _WorkerPool:
+    """_WorkerPool() -> _WorkerPool instance"""
+
+    def __init__(self):
+        """Initialize the pool of idle worker processes."""
+        self.__lock = threading.Lock()
+        self.__idle = []
+
+    def acquire(self):
+        """Return an idle worker, spawning one only when none are free."""
+        with self.__lock:
+            if self.__idle:
+                return self.__idle.pop()
+        return _Worker()
+
+    def release(self, worker):
+        """Return a still-healthy worker to the pool for reuse."""
+        with self.__lock:
+            self.__idle.append(worker)
+
+
+_POOL = _WorkerPool()
 
 
 class _Timeout:
@@ -57,45 +125,65 @@ class _Timeout:
         """Initialize the _Timeout instance will all needed attributes."""
         self.__entry_point = entry_point
         self.__limit = limit
-        self.__queue = multiprocessing.Queue()
-        self.__process = multiprocessing.Process()
+        self.__worker = None
+        self.__result = None
         self.__timeout = time.monotonic()
 
     def __call__(self, *args, **kwargs):
-        """Begin execution of the entry point in a separate process."""
+        """Begin execution of the entry point on a pooled worker process."""
         self.cancel()
-        self.__queue = multiprocessing.Queue(1)
-        self.__process = multiprocessing.Process(
-            target=_target,
-            args=(self.__queue, self.__entry_point) + args,
-            kwargs=kwargs
-        )
-        self.__process.daemon = True
-        self.__process.start()
+        self.__result = None
+        self.__worker = _POOL.acquire()
+        self.__worker.submit(self.__entry_point, args, kwargs)
         self.__timeout = time.monotonic() + self.__limit
 
     def cancel(self):
         """Terminate execution if possible."""
-        if self.__process.is_alive():
-            self.__process.terminate()
+        worker, self.__worker = self.__worker, None
+        if worker is not None:
+            worker.terminate()
+
+    def wait(self, timeout):
+        """Block on the result instead of polling; return readiness."""
+        if self.__result is not None:
+            return True
+        worker = self.__worker
+        if worker is None:
+            return False
+        result = worker.wait(timeout)
+        if result is None:
+            self.cancel()
+            return False
+        self.__result = result
+        self.__worker = None
+        _POOL.release(worker)
+        return True
 
     @property
     def ready(self):
         """Property letting callers know if a returned value is available."""
-        if self.__queue.full():
+        if self.__result is not None:
             return True
-        elif not self.__queue.empty():
-            return True
-        elif self.__timeout < time.monotonic():
-            self.cancel()
-        else:
-            return False
+        worker = self.__worker
+        if worker is not None:
+            result = worker.poll()
+            if result is not None:
+                # The worker finished cleanly, so it can serve again.
+                self.__result = result
+                self.__worker = None
+                _POOL.release(worker)
+                return True
+            if self.__timeout < time.monotonic():
+                self.cancel()
+            else:
+                return False
 
     @property
     def value(self):
         """Property that retrieves a returned value if available."""
         if self.ready is True:
-            valid, value = self.__queue.get()
+            valid, value = self.__result
+            self.__result = None
             if valid:
                 return value
             raise value
@@ -116,3 +204,90 @@ class _Timeout:
         """Verify that the limit's value is not too low."""
         if value <= 0:
             raise ValueError('limit must be greater than zero')
+
+
+class _ThreadTimeout:
+    """_ThreadTimeout(entry_point, limit) -> _ThreadTimeout instance"""
+
+    def __init__(self, entry_point, limit):
+        """Initialize the _ThreadTimeout instance with its attributes."""
+        self.__entry_point = entry_point
+        self.__limit = limit
+        self.__done = None
+        self.__slot = None
+        self.__result = None
+        self.__timeout = time.monotonic()
+
+    def __call__(self, *args, **kwargs):
+        """Begin execution of the entry point in a daemon thread."""
+        self.cancel()
+        self.__result = None
+        self.__done = done = threading.Event()
+        self.__slot = slot = []
+        entry_point = self.__entry_point
+
+        def target():
+            # noinspection PyPep8,PyBroadException
+            try:
+                slot.append((True, entry_point(*args, **kwargs)))
+            except:
+                slot.append((False, sys.exc_info()[1]))
+            done.set()
+
+        threading.Thread(target=target, daemon=True).start()
+        self.__timeout = time.monotonic() + self.__limit
+
+    def cancel(self):
+        """Abandon the call; threads cannot be forcibly terminated."""
+        self.__done = self.__slot = None
+
+    def wait(self, timeout):
+        """Block on the result instead of polling; return readiness."""
+        if self.__result is not None:
+            return True
+        done = self.__done
+        if done is None:
+            return False
+        if done.wait(timeout):
+            self.__result = self.__slot[0]
+            self.cancel()
+            return True
+        self.cancel()
+        return False
+
+    @property
+    def ready(self):
+        """Property letting callers know if a returned value is available."""
+        if self.__result is not None:
+            return True
+        done = self.__done
+        if done is not None:
+            if done.is_set():
+                self.__result = self.__slot[0]
+                self.cancel()
+                return True
+            if self.__timeout < time.monotonic():
+                self.cancel()
+            else:
+                return False
+
+    @property
+    def value(self):
+        """Property that retrieves a returned value if available."""
+        if self.ready is True:
+            valid, value = self.__result
+            self.__result = None
+            if valid:
+                return value
+            raise value
+        raise TimeoutError('execution timed out before terminating')
+
+    @property
+    def limit(self):
+        """Property controlling what the timeout period is in seconds."""
+        return self.__limit
+
+    @limit.setter
+    def limit(self, value):
+        _Timeout.validate_limit(value)
+        self.__limit = value